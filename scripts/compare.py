@@ -1,18 +1,38 @@
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from functools import lru_cache
+import numpy as np
+from embedding_model import load_model
 
 print("Loading model...")
-model = SentenceTransformer('all-MiniLM-L6-v2')
+# Interactive inputs are short; a tighter cap keeps tokenizer padding small
+model = load_model(max_seq_length=128)
+
+@lru_cache(maxsize=1024)
+def embed(text):
+    """Unit-length embedding; repeated texts skip the forward pass."""
+    return model.encode([text], normalize_embeddings=True, convert_to_numpy=True)[0]
 
 while True:
     text1 = input("\nText 1 (or 'q' to quit): ")
     if text1.lower() == 'q':
         break
-    text2 = input("Text 2: ")
-    
-    embeddings = model.encode([text1, text2])
-    score = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-    
-    print(f"\nText 1 embedding: {embeddings[0][:5]}... (384 dims)")
-    print(f"Text 2 embedding: {embeddings[1][:5]}... (384 dims)")
-    print(f"\nSimilarity score: {score:.4f}")
+    text2 = input("Text 2 (separate several with ' | '): ")
+    references = [t.strip() for t in text2.split(' | ')]
+
+    # Unit-length embeddings: cosine similarity is just the dot product
+    a = embed(text1)
+    if len(references) == 1:
+        b = embed(text2)
+        score = float(a @ b)
+
+        print(f"\nText 1 embedding: {a[:5]}... (384 dims)")
+        print(f"Text 2 embedding: {b[:5]}... (384 dims)")
+        print(f"\nSimilarity score: {score:.4f}")
+    else:
+        # (N, 384) float32 matrix times one vector: a single BLAS sgemv
+        B = np.stack([embed(t) for t in references])
+        scores = B @ a
+
+        print(f"\nText 1 embedding: {a[:5]}... (384 dims)")
+        print("\nSimilarity scores:")
+        for i in np.argsort(-scores):
+            print(f"  {scores[i]:.4f} - {references[i]}")
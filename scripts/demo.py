@@ -6,15 +6,17 @@ commands = {
     "setup": "embed_demo.py",
     "seed": "seed.py",
     "compare": "compare.py",
-    "search": "search.py"
+    "search": "search.py",
+    "server": "embed_server.py"
 }
 
 if len(sys.argv) < 2 or sys.argv[1] not in commands:
-    print("Usage: python demo.py [setup|seed|compare|search]")
+    print("Usage: python demo.py [setup|seed|compare|search|server]")
     print("\n  setup   - Initialize database and add sample data")
     print("  seed    - Add custom texts to database")
     print("  compare - Compare two texts interactively")
     print("  search  - Search for similar texts in database")
+    print("  server  - Keep the model loaded for seed/compare/search")
     sys.exit(1)
 
 subprocess.run([sys.executable, commands[sys.argv[1]]])
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+One-time distillation of all-MiniLM-L6-v2 into a model2vec static model.
+Run seed.py / search.py with EMBEDDING_MODEL=static to use it.
+Keeps 384 dimensions, so the demo table schema does not change.
+"""
+
+from model2vec.distill import distill
+from embedding_model import STATIC_DIR
+
+def main():
+    print("Distilling sentence-transformers/all-MiniLM-L6-v2 (this may take a moment)...")
+    model = distill('sentence-transformers/all-MiniLM-L6-v2', pca_dims=384)
+    model.save_pretrained(STATIC_DIR)
+    print(f"Done! Saved to {STATIC_DIR}")
+    print("Re-seed the demo table with EMBEDDING_MODEL=static before searching.")
+
+if __name__ == "__main__":
+    main()
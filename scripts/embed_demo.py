@@ -1,5 +1,6 @@
 import os
 import psycopg2
+from pgvector.psycopg2 import register_vector
 from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
 
@@ -11,6 +12,8 @@ cur = conn.cursor()
 
 # 2. Reset the Table
 cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+# Let psycopg2 send numpy arrays straight into vector columns
+register_vector(conn)
 cur.execute("DROP TABLE IF EXISTS documents;")
 # Note: '384' is the specific dimension size of the 'all-MiniLM-L6-v2' model
 cur.execute("CREATE TABLE documents (id serial PRIMARY KEY, content text, embedding vector(384));")
@@ -32,11 +35,10 @@ sentences = [
 
 # 5. Generate Embeddings & Insert
 print("Generating vectors and inserting...")
-embeddings = model.encode(sentences)
+embeddings = model.encode(sentences, normalize_embeddings=True)
 
 for content, vector in zip(sentences, embeddings):
-    # Convert numpy array to standard list for Postgres
-    cur.execute("INSERT INTO documents (content, embedding) VALUES (%s, %s)", (content, vector.tolist()))
+    cur.execute("INSERT INTO documents (content, embedding) VALUES (%s, %s)", (content, vector))
 
 conn.commit()
 print("Done! Data is in Postgres.")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Keep the MiniLM model resident and serve encode() calls over a local socket.
+While this is running, compare.py, search.py and seed.py skip loading the
+model themselves and start instantly.
+
+Requires EMBED_SERVER_KEY (in .env or the environment), shared with the
+clients. Requests are pickled, so pick a private value.
+"""
+
+import sys
+import threading
+from multiprocessing.connection import Listener, AuthenticationError, deliver_challenge, answer_challenge
+from embedding_model import load_model, model_kind, SERVER_ADDRESS, SERVER_AUTHKEY
+
+def serve(conn, model, lock, kind):
+    """Authenticate one client, then answer its encode requests until it disconnects."""
+    with conn:
+        try:
+            # Same handshake Listener.accept() does, but off the accept loop
+            # so a stalled client only ties up its own thread
+            deliver_challenge(conn, SERVER_AUTHKEY)
+            answer_challenge(conn, SERVER_AUTHKEY)
+            # Clients check this so they never mix embedding spaces
+            conn.send({'model': kind})
+        except (AuthenticationError, OSError, EOFError):
+            return
+
+        while True:
+            try:
+                request = conn.recv()
+            except (OSError, EOFError):
+                break
+            try:
+                with lock:
+                    result = model.encode(request['texts'], **request['kwargs'])
+            except Exception as e:
+                result = e
+            try:
+                conn.send(result)
+            except OSError:
+                break
+
+def main():
+    if not SERVER_AUTHKEY:
+        print("EMBED_SERVER_KEY is not set. Add a private value to .env;")
+        print("seed.py, compare.py and search.py read the same key.")
+        sys.exit(1)
+
+    print("Loading model...")
+    model = load_model(use_server=False)
+    kind = model_kind()
+    lock = threading.Lock()
+
+    with Listener(SERVER_ADDRESS) as listener:
+        print(f"Embedding server ({kind}) listening on {SERVER_ADDRESS[0]}:{SERVER_ADDRESS[1]} (Ctrl+C to stop)")
+        while True:
+            try:
+                conn = listener.accept()
+            except (AuthenticationError, OSError, EOFError):
+                continue
+            threading.Thread(target=serve, args=(conn, model, lock, kind), daemon=True).start()
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,116 @@
+"""
+Shared MiniLM loader for compare.py, search.py and seed.py.
+Uses the int8 ONNX export from export_onnx_model.py when it exists,
+otherwise falls back to the regular PyTorch model.
+
+Set EMBEDDING_MODEL=static to use the model2vec distillation from
+distill_static_model.py instead. Its vectors live in a different space
+than MiniLM's, so re-seed the demo table after switching.
+
+If embed_server.py is running with the same EMBED_SERVER_KEY and model,
+load_model() returns a thin client for it instead, so the scripts start
+without importing torch or loading weights.
+"""
+
+import os
+import threading
+from multiprocessing.connection import Client, AuthenticationError
+from dotenv import load_dotenv
+
+# Model and server settings may come from .env
+load_dotenv()
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models')
+ONNX_DIR = os.path.join(MODELS_DIR, 'minilm-int8')
+ONNX_FILE = 'onnx/model_qint8.onnx'
+STATIC_DIR = os.path.join(MODELS_DIR, 'm2v-minilm')
+
+SERVER_ADDRESS = ('localhost', int(os.getenv('EMBED_SERVER_PORT', '6000')))
+# No default: requests are pickled, so the key must be private
+SERVER_AUTHKEY = os.getenv('EMBED_SERVER_KEY', '').encode()
+SERVER_TIMEOUT = 2.0
+
+def model_kind():
+    """Embedding space load_model() produces locally: 'static' or 'minilm'."""
+    return 'static' if os.getenv('EMBEDDING_MODEL') == 'static' else 'minilm'
+
+class RemoteModel:
+    """Forwards encode() calls to a running embed_server.py."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def encode(self, sentences, **kwargs):
+        self.conn.send({'texts': sentences, 'kwargs': kwargs})
+        result = self.conn.recv()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+def connect_server():
+    """Return a RemoteModel for a running embed_server.py, or None.
+
+    Gives up (so the caller loads the model locally) when no key is set,
+    nothing answers, the handshake fails or stalls, or the server holds a
+    different model than this process would load.
+    """
+    if not SERVER_AUTHKEY:
+        return None
+
+    result = []
+
+    def handshake():
+        try:
+            conn = Client(SERVER_ADDRESS, authkey=SERVER_AUTHKEY)
+            if conn.poll(SERVER_TIMEOUT):
+                result.append((conn, conn.recv()))
+            else:
+                conn.close()
+        except (OSError, EOFError, AuthenticationError):
+            pass
+
+    # Client() has no timeout of its own; don't let a stalled peer hang startup
+    thread = threading.Thread(target=handshake, daemon=True)
+    thread.start()
+    thread.join(SERVER_TIMEOUT)
+    if not result:
+        return None
+
+    conn, hello = result[0]
+    server_kind = hello.get('model') if isinstance(hello, dict) else None
+    if server_kind != model_kind():
+        print(f"Embedding server has the '{server_kind}' model, EMBEDDING_MODEL wants '{model_kind()}'; loading locally...")
+        conn.close()
+        return None
+    return RemoteModel(conn)
+
+def load_model(use_server=True, max_seq_length=None):
+    """Load the 384-dim MiniLM encoder, preferring the quantized ONNX build.
+
+    max_seq_length caps the tokenizer for a locally loaded transformer;
+    the model default (256 wordpieces) is kept when it is None.
+    """
+    if use_server:
+        remote = connect_server()
+        if remote is not None:
+            print("Using embedding server...")
+            return remote
+
+    if model_kind() == 'static':
+        from model2vec import StaticModel
+        # Same encode() API, but just a token lookup + mean pool per query
+        return StaticModel.from_pretrained(STATIC_DIR, normalize=True)
+
+    from sentence_transformers import SentenceTransformer
+    if os.path.exists(os.path.join(ONNX_DIR, ONNX_FILE)):
+        model = SentenceTransformer(
+            ONNX_DIR,
+            backend='onnx',
+            model_kwargs={'provider': 'CPUExecutionProvider', 'file_name': ONNX_FILE}
+        )
+    else:
+        model = SentenceTransformer(MODEL_NAME)
+    if max_seq_length is not None:
+        model.max_seq_length = max_seq_length
+    return model
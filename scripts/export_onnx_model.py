@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+One-time export of all-MiniLM-L6-v2 to an int8 ONNX model.
+compare.py, search.py and seed.py pick it up automatically once it exists.
+
+Usage: python export_onnx_model.py [avx512_vnni|avx512|avx2|arm64]
+Pick arm64 on Apple Silicon; the default targets VNNI-capable x86 CPUs.
+"""
+
+import sys
+from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+from embedding_model import MODEL_NAME, ONNX_DIR
+
+CONFIGS = ["avx512_vnni", "avx512", "avx2", "arm64"]
+
+def main():
+    config = sys.argv[1] if len(sys.argv) > 1 else "avx512_vnni"
+    if config not in CONFIGS:
+        print(f"Usage: python export_onnx_model.py [{'|'.join(CONFIGS)}]")
+        sys.exit(1)
+
+    print(f"Exporting {MODEL_NAME} to ONNX...")
+    model = SentenceTransformer(MODEL_NAME, backend='onnx')
+    model.save(ONNX_DIR)
+
+    print(f"Quantizing to int8 ({config})...")
+    # Fixed suffix so the loader finds the file whichever config was used
+    export_dynamic_quantized_onnx_model(model, config, ONNX_DIR, file_suffix='qint8')
+
+    print(f"Done! Saved to {ONNX_DIR}")
+
+if __name__ == "__main__":
+    main()
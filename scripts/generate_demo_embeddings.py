@@ -3,11 +3,22 @@
 Generate real embeddings with meaningful text content for pgvector demo.
 This creates 50,000 diverse documents with realistic random text.
 Uses 1024 dimensions from BGE-large model to demonstrate TOAST behavior.
+
+Pass --halfvec to store the vectors as halfvec(1024) (fp16, ~2 KB each)
+instead of vector(1024). The SQL walkthrough assumes the default.
+Pass --compile to run the encoder through torch.compile.
 """
 
+import argparse
 import psycopg2
 from sentence_transformers import SentenceTransformer
+import numpy as np
+import torch
 import random
+import struct
+import queue
+import threading
+import io
 import os
 from dotenv import load_dotenv
 from tqdm import tqdm
@@ -57,7 +68,84 @@ def generate_diverse_text():
             wiki_iter = iter(wiki_dataset)
             continue
 
+def prefetch_batches(batches, batch_size, depth=8):
+    """Yield text batches generated on a background thread.
+
+    WikiText is a single sequential stream, so one producer thread is
+    enough to keep the model fed while it encodes the previous batch.
+    """
+    q = queue.Queue(maxsize=depth)
+
+    def producer():
+        try:
+            for _ in range(batches):
+                q.put([generate_diverse_text() for _ in range(batch_size)])
+        except Exception as e:
+            q.put(e)
+
+    threading.Thread(target=producer, daemon=True).start()
+    for _ in range(batches):
+        texts = q.get()
+        if isinstance(texts, Exception):
+            raise texts
+        yield texts
+
+def pick_device():
+    """Prefer CUDA, then Apple Silicon (MPS), then CPU."""
+    if torch.cuda.is_available():
+        return 'cuda'
+    if torch.backends.mps.is_available():
+        return 'mps'
+    return 'cpu'
+
+def compile_encoder(model):
+    """torch.compile the transformer, keeping it only if it matches eager output."""
+    sample = ["pgvector stores embeddings inside Postgres.", "Large values are moved out of line by TOAST."]
+    expected = model.encode(sample, normalize_embeddings=True)
+    eager = model[0].auto_model
+    try:
+        # dynamic=True: batches are padded to different lengths
+        model[0].auto_model = torch.compile(eager, dynamic=True)
+        compiled = model.encode(sample, normalize_embeddings=True)
+    except Exception as e:
+        # e.g. no Triton / C compiler, or an unsupported MPS op
+        print(f"   torch.compile: failed ({type(e).__name__}: {e}), using eager model")
+        model[0].auto_model = eager
+        return
+    if np.allclose(expected, compiled, atol=1e-3):
+        print("   torch.compile: enabled")
+    else:
+        print("   torch.compile: output mismatch, using eager model")
+        model[0].auto_model = eager
+
+def copy_docs(cur, texts, embeddings, dtype='>f4'):
+    """Load a batch into docs with binary COPY (raw float vectors, no text parsing)."""
+    # pgvector's binary vector/halfvec: uint16 dim, uint16 unused, then
+    # big-endian float32s ('>f4') or float16s ('>f2')
+    vectors = np.asarray(embeddings, dtype=dtype)
+    dim = vectors.shape[1]
+    vector_header = struct.pack('>iHH', 4 + vectors.itemsize * dim, dim, 0)
+
+    buf = io.BytesIO()
+    buf.write(b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0))
+    for text, vector in zip(texts, vectors):
+        content = text.encode('utf-8')
+        buf.write(struct.pack('>hi', 2, len(content)) + content)
+        buf.write(vector_header + vector.tobytes())
+    buf.write(struct.pack('>h', -1))
+    buf.seek(0)
+
+    cur.copy_expert("COPY docs (content, embedding) FROM STDIN WITH (FORMAT BINARY)", buf)
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate embeddings for the pgvector demo.")
+    parser.add_argument("--halfvec", action="store_true",
+                        help="store embeddings as halfvec(1024) instead of vector(1024)")
+    parser.add_argument("--compile", action="store_true",
+                        help="torch.compile the encoder (slow first batch, faster after)")
+    args = parser.parse_args()
+    column_type, dtype, vector_kb = ('halfvec', '>f2', 2) if args.halfvec else ('vector', '>f4', 4)
+
     print("🚀 Generating embeddings for pgvector demo...")
     print("=" * 60)
     
@@ -74,12 +162,13 @@ def main():
     print("2. Setting up database schema...")
     cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
     cur.execute("DROP TABLE IF EXISTS docs;")
-    cur.execute("""
+    print(f"   Embedding column: {column_type}(1024)")
+    cur.execute(f"""
         CREATE TABLE docs (
             id serial PRIMARY KEY,
             content text,
-            embedding vector(1024),
-            metadata jsonb DEFAULT '{}'::jsonb
+            embedding {column_type}(1024),
+            metadata jsonb DEFAULT '{{}}'::jsonb
         );
     """)
     conn.commit()
@@ -88,34 +177,42 @@ def main():
     print("3. Loading sentence transformer model (this may take a moment)...")
     print("   Model: BAAI/bge-large-en-v1.5 (1024 dimensions)")
     print("   This model naturally outputs 1024d vectors (>2KB, will be TOASTed)")
-    model = SentenceTransformer('BAAI/bge-large-en-v1.5')
+    device = pick_device()
+    # SDPA dispatches to fused (flash / memory-efficient) attention kernels
+    model = SentenceTransformer(
+        'BAAI/bge-large-en-v1.5',
+        device=device,
+        model_kwargs={'attn_implementation': 'sdpa'}
+    )
+    if device != 'cpu':
+        # fp16 GEMMs on the accelerator; CPUs have no fast fp16 path
+        model.half()
+    print(f"   Device: {device}{' (fp16)' if device != 'cpu' else ''}")
+    if args.compile:
+        compile_encoder(model)
     
     # Generate and insert documents
     print("\n4. Generating 50,000 diverse documents with embeddings...")
     print("   This will take 10-15 minutes...")
     print("   ✓ Using WikiText dataset for meaningful content")
     
-    batch_size = 100
+    batch_size = 250
     total_docs = 50000
     batches = total_docs // batch_size
     
-    for batch_num in tqdm(range(batches), desc="Generating embeddings", unit="batch"):
-        texts = []
-        
-        # Generate batch of diverse texts
-        for _ in range(batch_size):
-            text = generate_diverse_text()
-            texts.append(text)
-        
+    # Text for upcoming batches is generated while the current one encodes
+    for texts in tqdm(prefetch_batches(batches, batch_size), total=batches, desc="Generating embeddings", unit="batch"):
         # Generate embeddings for batch (1024 dimensions from model)
-        embeddings = model.encode(texts, show_progress_bar=False)
+        embeddings = model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
         
         # Insert batch
-        for text, embedding in zip(texts, embeddings):
-            cur.execute(
-                "INSERT INTO docs (content, embedding) VALUES (%s, %s)",
-                (text, embedding.tolist())
-            )
+        copy_docs(cur, texts, embeddings, dtype)
         
         conn.commit()
     
@@ -146,7 +243,7 @@ def main():
     
     # Show sample documents
     print("\n6. Sample documents:")
-    cur.execute("SELECT id, content, array_length(embedding::float4[], 1) as dims, pg_column_size(embedding) as bytes FROM docs LIMIT 5;")
+    cur.execute("SELECT id, content, vector_dims(embedding) as dims, pg_column_size(embedding) as bytes FROM docs LIMIT 5;")
     for row in cur.fetchall():
         print(f"   [{row[0]}] {row[1][:50]}... ({row[2]} dims, {row[3]} bytes)")
     
@@ -161,7 +258,7 @@ def main():
     print("   pgvector_deep_dive_demo.md")
     print("\n💡 Key points:")
     print("   - 50,000 diverse documents")
-    print("   - 1024 dimensions (~4 KB per vector)")
+    print(f"   - 1024 dimensions (~{vector_kb} KB per vector, {column_type})")
     print("   - Vectors are TOASTed (> 2KB threshold)")
     print("   - Real WikiText content")
     print("=" * 60)
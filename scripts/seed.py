@@ -1,6 +1,8 @@
 import os
 import psycopg2
-from sentence_transformers import SentenceTransformer
+from psycopg2.extras import execute_values
+from pgvector.psycopg2 import register_vector
+from embedding_model import load_model
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,29 +20,40 @@ cur.execute("""
         embedding vector(384)
     );
 """)
+# HNSW index for search.py; ip ops to match its <#> ordering
+cur.execute("""
+    CREATE INDEX IF NOT EXISTS demo_embedding_hnsw ON demo
+    USING hnsw (embedding vector_ip_ops) WITH (m = 16, ef_construction = 64);
+""")
 conn.commit()
+register_vector(conn)
 
 # Load model
-model = SentenceTransformer('all-MiniLM-L6-v2')
+model = load_model()
 
 print("Enter texts (one per line, empty line to finish):")
-count = 0
+texts = []
 while True:
-    text = input("> ")
+    try:
+        text = input("> ")
+    except EOFError:
+        # Piped input or Ctrl-D: keep what was entered so far
+        break
     if not text:
         break
-    
-    embedding = model.encode(text)
-    cur.execute(
-        "INSERT INTO demo (content, embedding) VALUES (%s, %s)", 
-        (text, embedding.tolist())
+    texts.append(text)
+
+# Encode everything in one batch and insert in a single transaction
+if texts:
+    embeddings = model.encode(texts, batch_size=32, normalize_embeddings=True)
+    execute_values(
+        cur,
+        "INSERT INTO demo (content, embedding) VALUES %s",
+        list(zip(texts, embeddings)),
+        template="(%s, %s::vector)"
     )
     conn.commit()
-    count += 1
-    print(f"✓ Added to DB")
-
-if count > 0:
-    print(f"\nTotal: {count} texts added")
+    print(f"\nTotal: {len(texts)} texts added")
 else:
     print("No texts entered")
 